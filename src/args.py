@@ -78,6 +78,12 @@ parser.add_argument(
 parser.add_argument(
     "--no-repeat", action="store_true", help="don't repeat if identifier exists"
 )
+parser.add_argument(
+    "--workers",
+    type=int,
+    default=8,
+    help="number of search requests sent to GPortal in parallel",
+)
 parser.add_argument(
     "--cred",
     type=Path,
@@ -119,6 +125,10 @@ if args.api == SGLIAPIs.GPORTAL:
         print("Invalid Product value for GPortal")
         exit(1)
 
+if args.workers < 1:
+    print("workers must be at least 1")
+    exit(1)
+
 if not args.csv:
     print("Data must be provided using csv")
     exit(1)
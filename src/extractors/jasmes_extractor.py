@@ -14,61 +14,79 @@ from src.extractors.extractor_interface import Extractor
 import numpy as np
 from netCDF4 import Dataset
 
+DN_ATTRS = [
+    "Minimum_valid_DN",
+    "Maximum_valid_DN",
+    "Error_DN",
+    "No_observation_DN",
+    "scale_factor",
+    "add_offset",
+    "Rrs_scale_factor",
+    "Rrs_add_offset",
+]
+
 class JASMESExtractor(Extractor):
     def __init__(self, path: Path, prod:JASMESInternalProd):
         self.__prod = prod
         self.__nc = Dataset(path, "r")
+        self.__attrs: dict = None # DN validity and scaling attributes of the product
+        self.__lat: np.ndarray = None
+        self.__lon: np.ndarray = None
 
-    def __handle_digital_number(self, rrs: bool = False) -> np.ndarray:
+    def __read_attrs(self) -> dict:
         """
-        Convert digital number to the desired product with DN masking
-        :prod JASMESProd 
+        Read the DN validity and scaling attributes of the product once
         """
-        # Get data
-        prod:str = str(self.__prod.value)
-
-        data = self.__nc.variables[prod]
+        if self.__attrs is None:
+            data = self.__nc.variables[str(self.__prod.value)]
+            self.__attrs = {k: getattr(data, k) for k in DN_ATTRS if hasattr(data, k)}
+        return self.__attrs
 
-        # Extract raw DN data as numpy array
-        raw_dn = data[:].data.astype(np.float32)
+    def __dn_to_phys(self, raw_dn: np.ndarray, rrs: bool = False) -> np.ndarray:
+        """
+        Mask invalid DN values and convert them to the desired product
+        :raw_dn np.ndarray values read from the product, either the whole grid or a single pixel
+                (modified in place when already float32)
+        """
+        attrs = self.__read_attrs()
+        raw_dn = np.asarray(raw_dn, dtype=np.float32)
 
         # Mask DN values that are outside valid range or represent error/no observation
-        mask = np.full(raw_dn.shape, False, dtype=bool)
-
-        # Mask DN < Minimum_valid_DN
-        if hasattr(data, "Minimum_valid_DN"):
-            mask |= (raw_dn < data.Minimum_valid_DN)
-
-        # Mask DN > Maximum_valid_DN
-        if hasattr(data, "Maximum_valid_DN"):
-            mask |= (raw_dn > data.Maximum_valid_DN)
+        # the range checks are fused into one expression, missing bounds never mask
+        mask = (raw_dn < attrs.get("Minimum_valid_DN", -np.inf)) | (raw_dn > attrs.get("Maximum_valid_DN", np.inf))
 
         # Mask DN == Error_DN
-        if hasattr(data, "Error_DN"):
-            mask |= (raw_dn == data.Error_DN)
+        if "Error_DN" in attrs:
+            mask |= (raw_dn == attrs["Error_DN"])
 
         # Mask DN == No_observation_DN
-        if hasattr(data, "No_observation_DN"):
-            mask |= (raw_dn == data.No_observation_DN)
+        if "No_observation_DN" in attrs:
+            mask |= (raw_dn == attrs["No_observation_DN"])
 
-        # Set masked DN to NaN before any conversion
-        raw_dn = np.where(mask, np.nan, raw_dn)
+        # Set masked DN to NaN before any conversion (in place, no extra grid is allocated)
+        raw_dn[mask] = np.nan
 
         # Convertion from DN to physical value is done automatically by netCDF4 if scale and offset attributes exist
         if rrs:
-            scale  = data.Rrs_scale_factor
-            offset = data.Rrs_add_offset
+            scale  = attrs["Rrs_scale_factor"]
+            offset = attrs["Rrs_add_offset"]
             # VIP Note: as NetCDF4 automatically applies scale_factor and add_offset to Rrs, we need to reverse that first
             #  then apply the Rrs scaling and offset
-            digital_data = (raw_dn - data.add_offset)/data.scale_factor
+            # computed in float64 so the offsets don't cancel out the precision of the pixel
+            digital_data = (raw_dn.astype(np.float64) - attrs["add_offset"])/attrs["scale_factor"]
             physical_data = digital_data * scale + offset
         else:
             physical_data = raw_dn
 
         return physical_data
-    
+
     def get_lat_lon(self) -> tuple[list[float], list[float]]:
-        return self.__nc.variables["Latitude"][:].data, self.__nc.variables["Longitude"][:].data
+        # read the coordinates once and reuse them for every pixel
+        # float32 keeps ~1e-5 degree precision, far finer than the grid, at half the memory traffic
+        if self.__lat is None:
+            self.__lat = np.ascontiguousarray(self.__nc.variables["Latitude"][:].data, dtype=np.float32)
+            self.__lon = np.ascontiguousarray(self.__nc.variables["Longitude"][:].data, dtype=np.float32)
+        return self.__lat, self.__lon
     
     @classmethod
     def get_file_ext(self)->str:
@@ -78,30 +96,23 @@ class JASMESExtractor(Extractor):
         return file_name
 
     def __find_entry(self, lat_arr, lon_arr, lat, lon) ->tuple[int, int]:
-        dist = 1000
-        lat_index = -1
-        for i,l in enumerate(lat_arr):
-            if np.abs(l - lat) < dist:
-                dist = np.abs(l-lat)
-                lat_index = i
-        lon_index = -1
-        dist = 1000
-        for i,l in enumerate(lon_arr):
-            if np.abs(l - lon) < dist:
-                dist = np.abs(l-lon)
-                lon_index = i
+        lat_arr = np.asarray(lat_arr)
+        lon_arr = np.asarray(lon_arr)
+        # cast the query to the array type so the subtraction is not upcast to float64
+        lat_index = int(np.argmin(np.abs(lat_arr - lat_arr.dtype.type(lat))))
+        lon_index = int(np.argmin(np.abs(lon_arr - lon_arr.dtype.type(lon))))
         return lat_index, lon_index
 
     def get_pixel(self, lat:float, lon:float) -> dict:
         lat_mat, lon_mat = self.get_lat_lon()
         row, col = self.__find_entry(lat_mat, lon_mat, lat, lon)
-        if str(self.__prod.value).startswith("NWL"):
-            pixel = {
-                f"{str(self.__prod.value)}_JASMES": self.__handle_digital_number()[row, col],
-                f"{str(self.__prod.value).replace('NWLR', 'Rrs')}_JASMES": self.__handle_digital_number(rrs=True)[row, col]
-            }
-        else:
-            pixel = {
-                f"{str(self.__prod.value)}_JASMES": self.__handle_digital_number()[row, col],
-            }
+        prod:str = str(self.__prod.value)
+        # read only the matching pixel instead of the whole grid
+        # (sliced so that a masked pixel keeps its underlying value like the full grid read)
+        raw_dn = self.__nc.variables[prod][row:row+1, col:col+1].data[0, 0]
+        pixel = {
+            f"{prod}_JASMES": float(self.__dn_to_phys(raw_dn)),
+        }
+        if prod.startswith("NWL"):
+            pixel[f"{prod.replace('NWLR', 'Rrs')}_JASMES"] = float(self.__dn_to_phys(raw_dn, rrs=True))
         return pixel
\ No newline at end of file
@@ -33,6 +33,7 @@ from src.jasmes.jasmes_api import JASMESInternalProd
 class JASMESMultiExtractor(Extractor):
     def __init__(self, paths: dict):
         self.__paths = paths
+        self.__extractors: dict[str, JASMESExtractor] = {} # opened once and reused across pixels
 
     @classmethod
     def get_file_ext(self)->str:
@@ -44,8 +45,9 @@ class JASMESMultiExtractor(Extractor):
     def get_pixel(self, lat:float, lon:float) -> dict:
         result = {}
         for k in self.__paths.keys():
-            prod = JASMESInternalProd(k)
-            extractor = JASMESExtractor(self.__paths[k], prod)
+            if k not in self.__extractors:
+                self.__extractors[k] = JASMESExtractor(self.__paths[k], JASMESInternalProd(k))
+            extractor = self.__extractors[k]
             pixel = extractor.get_pixel(lat, lon)
             result.update(pixel)
         return result
@@ -109,12 +109,14 @@ class GportalApi:
             t.start()
         
         try: # send the request and wait for the response from GPortal
-            res = requests.post(self.baseurl, data=body, headers=self.headers)
-        except requests.exceptions.ConnectionError: # if connection error return None
-            print(
-                "Connection aborted by GPortal, please try again with more specific search criteria.")
+            res = requests.post(self.baseurl, data=body, headers=self.headers, timeout=60)
+        except requests.exceptions.Timeout: # stop the loading message and let the caller retry
             self.done = True
-            return None
+            raise
+        except requests.exceptions.ConnectionError: # a throttled or aborted connection is retried by the caller
+            print("Connection aborted by GPortal")
+            self.done = True
+            raise
         
         # stop the loading message thread
         self.done = True 
@@ -130,7 +132,7 @@ class GportalApi:
         except:
             return None
         # filter the results to get a single product the best matchs the search criteria
-        return results.filter_results(longitude, latitude)
+        return results.filter_results(latitude, longitude)
 
     def download(self, url: str, output_dir: Path, max_workers=20)->Path:
         """
@@ -9,8 +9,9 @@
 #
 
 import numpy as np
+import shapely
+from shapely.geometry import Point
 from src.gportal.gportal_types import GPortalProperties, GPortalGeo
-from src.utils import inside_polygon, min_distance
 from pathlib import Path
 import pandas as pd
 
@@ -46,44 +47,35 @@ class GPortalResponse:
             "properties": self.properties.to_json()
         }
     
-    def to_dataframe(self, df:pd.DataFrame=None, index:int=None):
+    def to_row_dict(self) -> dict:
         """
-        appends the response to a dataframe in index
+        returns the output columns of the response as a single row
         """
+        return {
+            "identifier"    : self.properties.identifier,
+            "file_status"   : self.properties.status,
+            "download_url"  : self.properties.product.downloadUrl.geturl(),
+            "preview_url"   : self.properties.previews[0].url.geturl(),
+            "cloud_coverage": self.properties.meta.cloudCoverPercentage
+        }
+
+    def to_dataframe(self, df:pd.DataFrame=None):
+        """
+        appends the response as a new row to the end of a dataframe
+        to write many responses use GPortalSearchResult.to_dataframe which concatenates once
+        """
+        row = pd.DataFrame([self.to_row_dict()], columns=OUTPUT_COLUMNS)
         if df is None:
-            df = pd.DataFrame(columns=OUTPUT_COLUMNS)
-        if index is None:
-            index = 0
-            for c in OUTPUT_COLUMNS:
-                if c not in df.columns:
-                    df[c] = []
-        if(index == df.size):
-            j = pd.DataFrame([{
-                "identifier"    : self.properties.identifier,
-                "file_status"   : self.properties.status,
-                "download_url"  : self.properties.product.downloadUrl.geturl(),
-                "preview_url"   : self.properties.previews[0].url.geturl(),
-                "cloud_coverage": self.properties.meta.cloudCoverPercentage
-            }], columns=OUTPUT_COLUMNS)
-            df = pd.concat([df, j], axis=0, ignore_index=True)
-        else:
-            index = df.index[index]
-            df.loc[index, "identifier"] = self.properties.identifier
-            df.loc[index, "file_status"]=self.properties.status
-            df.loc[index, "download_url"]=self.properties.product.downloadUrl.geturl()
-            df.loc[index, "preview_url"]=self.properties.previews[0].url.geturl()
-            df.loc[index, "cloud_coverage"]=self.properties.meta.cloudCoverPercentage
-        return df
+            return row
+        return pd.concat([df, row], axis=0, ignore_index=True)
     
 
     def save(self, path: Path):
         """
         saves to csv file
         """
-        try:
-            df = pd.read_csv(path, low_memory=True)
-        except:
-            df = None
+        path = Path(path)
+        df = pd.read_csv(path, low_memory=True) if path.exists() else None
         df = self.to_dataframe(df)
         df.to_csv(path, index=False)
         return df
@@ -110,6 +102,25 @@ class GPortalSearchResult:
         """
         self.results = [GPortalResponse(f) for f in response["features"]]
 
+    def to_dataframe(self, df:pd.DataFrame=None):
+        """
+        appends all the results as new rows to the end of a dataframe
+        """
+        rows = pd.DataFrame([r.to_row_dict() for r in self.results], columns=OUTPUT_COLUMNS)
+        if df is None:
+            return rows
+        return pd.concat([df, rows], axis=0, ignore_index=True)
+
+    def save(self, path: Path):
+        """
+        saves all the results to csv file
+        """
+        path = Path(path)
+        df = pd.read_csv(path, low_memory=True) if path.exists() else None
+        df = self.to_dataframe(df)
+        df.to_csv(path, index=False)
+        return df
+
     def filter_results(self, lat:float, lon:float) -> GPortalResponse:
         """
         Filters the results to make sure the given latitude and longitude are within the product coordinates.
@@ -122,23 +133,21 @@ class GPortalSearchResult:
         """
         if len(self.results) == 0: return None
 
+        point = Point(lon, lat)
         filtered: list[GPortalResponse] = [] # contains all the products that INCLUDE the given lat and lon
         for f in self.results:
-            poly = f.geometry.coordinates
-            poly = np.array(poly)
-            poly = poly.T
-            if inside_polygon(poly[0], poly[1], lon, lat):
+            bbox = f.geometry.bbox
+            # skip the polygon test if the point is outside the bounding box
+            if not (bbox[0] <= lon <= bbox[2] and bbox[1] <= lat <= bbox[3]): continue
+            if f.geometry.prepared.contains(point):
                 filtered.append(f)
+        if len(filtered) == 0: return None
         if len(filtered) > 1:
-            boarder_dis = []
-            point = [lat, lon]
-            for i in range(len(filtered)):
-                polygon = filtered[i].geometry.coordinates
-                boarder_dis.append(min_distance(point, polygon))
-            j = boarder_dis.index(max(boarder_dis)) # index of the product with lat and lon closest to center
+            # distance from the point to the border of every product in a single call
+            exteriors = shapely.get_exterior_ring([f.geometry.polygon for f in filtered])
+            boarder_dis = shapely.distance(exteriors, point)
+            j = int(np.argmax(boarder_dis)) # index of the product with lat and lon closest to center
         else:
             j = 0
-        if len(filtered) == 0: return None
         return filtered[j]
     
-    
\ No newline at end of file
@@ -9,11 +9,18 @@
 #
 
 from enum import Enum
+import numpy as np
+from shapely.geometry import Polygon
+from shapely.prepared import prep, PreparedGeometry
 
 
 class GPortalGeo:
     type: str
-    coordinates: list[list[float]]
+    lon: np.ndarray
+    lat: np.ndarray
+    bbox: tuple[float]
+    polygon: Polygon
+    prepared: PreparedGeometry
 
     def __init__(self, response:dict) -> None:
         """
@@ -22,8 +29,19 @@ class GPortalGeo:
         :response dict the json dictionary of the response
         """
         self.type = str(response["type"])
-        self.coordinates = [[float(entry) for entry in part]
-                            for part in response["coordinates"][0]]
+        # stored as separate contiguous lon and lat arrays, the list form is only rebuilt for to_json
+        lonlat = np.asarray(response["coordinates"][0], dtype=np.float64)
+        self.lon = np.ascontiguousarray(lonlat[:, 0])
+        self.lat = np.ascontiguousarray(lonlat[:, 1])
+        self.bbox = (float(self.lon.min()), float(self.lat.min()), float(self.lon.max()), float(self.lat.max()))
+        # built once so that the point in polygon tests run in GEOS
+        self.polygon = Polygon(lonlat)
+        self.prepared = prep(self.polygon)
+
+    @property
+    def coordinates(self) -> list[list[float]]:
+        """the polygon ring as a list of [lon, lat] pairs"""
+        return np.column_stack((self.lon, self.lat)).tolist()
 
     def to_json(self) -> dict:
         return {
@@ -51,29 +51,22 @@ class JASMESResponse:
             sep="\n"
         )
 
-    def to_dataframe(self, df:pd.DataFrame=None, index:int=None):
+    def to_row_dict(self) -> dict:
         """
-        appends the response to a dataframe in index
+        returns the output columns of the response as a single row
         """
+        return {
+            "file_name"    : self.fileName,
+            "ftp_path"   : self.filePath,
+            "file_size"    : self.fileSize,
+            "box_id"   : self.boxId,
+        }
+
+    def to_dataframe(self, df:pd.DataFrame=None):
+        """
+        appends the response as a new row to the end of a dataframe
+        """
+        row = pd.DataFrame([self.to_row_dict()], columns=OUTPUT_COLUMNS)
         if df is None:
-            df = pd.DataFrame(columns=OUTPUT_COLUMNS)
-        if index is None:
-            index = 0
-            for c in OUTPUT_COLUMNS:
-                if c not in df.columns:
-                    df[c] = []
-        if(index == df.size):
-            j = pd.DataFrame([{
-                "file_name"    : self.fileName,
-                "ftp_path"   : self.filePath,
-                "file_size"    : self.fileSize,
-                "box_id"   : self.boxId,
-            }], columns=OUTPUT_COLUMNS)
-            df = pd.concat([df, j], axis=0, ignore_index=True)
-        else:
-            index = df.index[index]
-            df.loc[index, "file_name"] = self.fileName
-            df.loc[index, "ftp_path"]=self.filePath
-            df.loc[index, "file_size"]=self.fileSize
-            df.loc[index, "box_id"]=self.boxId
-        return df
+            return row
+        return pd.concat([df, row], axis=0, ignore_index=True)
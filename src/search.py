@@ -10,39 +10,110 @@
 
 
 from argparse import Namespace
+import numpy as np
 import pandas as pd
 from tqdm import tqdm
-import time
+import threading
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from sys import exit
 from src import download
 from src.api_types import SGLIAPIs
 from src.gportal import GportalApi, GPortalLvlProd, GPortalResolution
 from src.jasmes import JasmesCollector
+from src.gportal.gportal_response import OUTPUT_COLUMNS as GPORTAL_COLUMNS
+from src.jasmes.jasmes_types.jasmes_collection import OUTPUT_COLUMNS as JASMES_COLUMNS
 
-"""
-Utility function to get the value from a dict and validate it
-"""
-def get_value(d: dict, key: str):
+FLUSH_EVERY = 1000 # number of rows searched between checkpoints
+CHECKPOINT_KEYS = ["lat", "lon", "date"] # saved with each checkpoint row to match it to the csv row
+COLUMN_DTYPES = {"cloud_coverage": "float64"} # output columns that are not stored as object
+
+def get_value(values: np.ndarray, i: int):
     """
-    Utility function to get the value from a dict and validate it
+    Utility function to get the value at position i of a column array and validate it
     """
-    if key in d and d[key]:
-        return d[key]
-    
-def fill_group(df, g, api):
+    if values is not None and not pd.isna(values[i]) and values[i]:
+        return values[i]
     
-    for j in range(len(g)):
-        if api ==SGLIAPIs.GPORTAL:
-            df.loc[df.index[g.index[j]], "identifier"] = g.iloc[0]["identifier"]
-            df.loc[df.index[g.index[j]], "file_status"] = g.iloc[0]["file_status"]
-            #df.loc[df.index[g.index[j]], "resolution"] = g.iloc[0]["resolution"]
-            df.loc[df.index[g.index[j]], "download_url"] = g.iloc[0]["download_url"]
-            df.loc[df.index[g.index[j]], "preview_url"] = g.iloc[0]["preview_url"]
-            df.loc[df.index[g.index[j]], "cloud_coverage"] = g.iloc[0]["cloud_coverage"]
-        elif api == SGLIAPIs.JASMES:
-            df.loc[df.index[g.index[j]], "file_name"] = g.iloc[0]["file_name"]
-            df.loc[df.index[g.index[j]], "file_size"] = g.iloc[0]["file_size"]
-            df.loc[df.index[g.index[j]], "ftp_path"] = g.iloc[0]["ftp_path"]
-            df.loc[df.index[g.index[j]], "box_id"] = g.iloc[0]["box_id"]
+def fill_group(df: pd.DataFrame, positions: np.ndarray, columns: list[str]):
+    """
+    Copies the output columns of the first row of a group to all the rows of the group
+    positions are the row positions of the group in the dataframe
+    """
+    indexer = df.columns.get_indexer(columns)
+    df.iloc[positions, indexer] = df.iloc[positions[0], indexer].to_numpy()
+
+def prepare_columns(df: pd.DataFrame, columns: list[str]):
+    """
+    Adds the missing output columns and sets the dtype of all of them once before searching
+    so writing the results never inserts a column or changes its dtype.
+    """
+    for c in columns:
+        dtype = COLUMN_DTYPES.get(c, object)
+        if c not in df.columns:
+            df[c] = pd.Series(np.nan if dtype != object else None, index=df.index, dtype=dtype)
+        elif df[c].dtype != dtype:
+            df[c] = df[c].astype(dtype)
+
+def write_rows(df: pd.DataFrame, rows: list[dict], columns: list[str]) -> pd.DataFrame:
+    """
+    Writes the collected result rows into the output columns of the dataframe at once.
+    The output columns must be added first with prepare_columns.
+    rows is indexed by row position, None entries are left untouched.
+    Written entries are reset to None so the next call only writes new rows.
+
+    returns the written rows indexed by their position or None if nothing was written
+    """
+    positions = [i for i, r in enumerate(rows) if r is not None]
+    if len(positions) == 0: return None
+    out = pd.DataFrame([rows[i] for i in positions], columns=columns, index=positions)
+    out = out.astype(df.dtypes[columns].to_dict())
+    for c in columns:
+        df.iloc[positions, df.columns.get_loc(c)] = out[c].to_numpy()
+    for i in positions:
+        rows[i] = None
+    return out
+
+def save_checkpoint(df: pd.DataFrame, out: pd.DataFrame, path: Path):
+    """
+    Appends the newly written rows to the checkpoint file
+    only the new rows are written instead of rewriting the whole csv,
+    each row keeps its lat, lon and date so it can be matched against the csv when resuming
+    """
+    if out is None: return
+    keys = df.iloc[out.index][CHECKPOINT_KEYS].set_axis(out.index)
+    pd.concat([keys, out], axis=1).to_csv(path, mode="a", header=not path.exists())
+
+def load_checkpoint(df: pd.DataFrame, path: Path, columns: list[str]) -> bool:
+    """
+    Writes the rows saved in the checkpoint file of an interrupted search back into the dataframe
+
+    returns False without changing the dataframe if the checkpoint doesn't match the csv rows
+    """
+    part = pd.read_csv(path, index_col=0, low_memory=True)
+    if len(part) > 0 and (part.index.min() < 0 or part.index.max() >= len(df)):
+        return False
+    keys = df.iloc[part.index][CHECKPOINT_KEYS].to_numpy()
+    if not (keys == part[CHECKPOINT_KEYS].to_numpy()).all():
+        return False
+    rows: list[dict] = [None] * len(df)
+    for p, row in zip(part.index, part[columns].to_dict("records")):
+        rows[p] = row
+    write_rows(df, rows, columns)
+    return True
+
+def search_with_retry(api, date: str, lat: float, lon: float, resolution: GPortalResolution, stop: threading.Event):
+    """
+    Sends the search request, retrying every 10 seconds until it goes through
+    returns None without searching if stop is set (the search was interrupted)
+    """
+    while not stop.is_set():
+        try:
+            return api.search(date, lat, lon, resolution, verbose=False)
+        except Exception as e:
+            print(e)
+            stop.wait(10)
+    return None
 
 def search(args: Namespace):
     """
@@ -52,6 +123,7 @@ def search(args: Namespace):
         - product: GPortal Products or Jasmes Products
         - csv: path to csv file
         - no_repeat: boolean, if identifier exists will not search the corresponding row
+        - workers: number of search requests sent in parallel (GPORTAL only), default: 8
     CSV file columns:
         - date
         - lat
@@ -75,54 +147,79 @@ def search(args: Namespace):
         pl = GPortalLvlProd(args.product)
         api = GportalApi(pl)
         id_key = "identifier"
+        columns = GPORTAL_COLUMNS
     elif args.api == SGLIAPIs.JASMES:
         api = JasmesCollector()
         api.set_auth_details(args.cred)
         id_key = "file_name"
+        columns = JASMES_COLUMNS
 
     print("=============================")
     print("Searching CSV ...")
     print("=============================")
 
     df = pd.read_csv(args.csv, low_memory=True) # read csv
+    prepare_columns(df, columns)
+    checkpoint = Path(str(args.csv) + ".part") # rows found so far, removed once the search completes
+    if checkpoint.exists():
+        print("resuming from %s" % checkpoint)
+        if not load_checkpoint(df, checkpoint, columns):
+            print("%s doesn't match the rows of %s, remove it to start a new search" % (checkpoint, args.csv))
+            exit(1)
     grouped = df.groupby(["lat", "lon", "date"])
+    ids = df[id_key].to_numpy() if id_key in df.columns else None # read once instead of per row
     pbar = tqdm(total=len(df), position=0, leave=True) # prepare progress bar
-
-    for i, ((lat, lon, date), g) in enumerate(grouped):
-    
-        id = get_value(g.iloc[0].fillna(0).to_dict(), id_key)
-        resolution = GPortalResolution.H
-
-        # progress if no repeat and id exists
-        if id and args.no_repeat: 
-            fill_group(df, g, args.api)
-            pbar.update(len(g))
-            continue
-
-        search_error = False
-        while True:
-            if search_error:
-                time.sleep(10)
-            try:
-                # send search request 
-                result = api.search(date, lat, lon, resolution, verbose=False)
-                search_error = False
-            except Exception as e:
-                print(e)
-                search_error = True
-            if not search_error: break
-
-        # if results returned add to the data
-        if result != None:
-            for j in range(len(g)):
-                result.to_dataframe(df, g.index[j])
-
-        pbar.update(len(g)) # update progress bar
-
-        # save to csv every 100 row
-        if (i % 100 == 0): df.to_csv(args.csv, index=False)
-
+    rows: list[dict] = [None] * len(df) # result row of each df row, written to df in batches
+    last_flush = 0
+    # JASMES searches share a single ftp session so they are sent one at a time
+    workers = args.workers if args.api == SGLIAPIs.GPORTAL else 1
+    executor = ThreadPoolExecutor(max_workers=workers)
+    stop = threading.Event() # tells the workers to stop retrying
+    futures = {} # search request -> row positions of the group
+
+    try:
+        # positions holds the row positions of all the rows sharing the same lat, lon and date
+        for (lat, lon, date), positions in grouped.indices.items():
+            id = get_value(ids, positions[0])
+            resolution = GPortalResolution.H
+
+            # progress if no repeat and id exists
+            if id and args.no_repeat: 
+                fill_group(df, positions, columns)
+                pbar.update(len(positions))
+                continue
+
+            # send search request 
+            futures[executor.submit(search_with_retry, api, date, lat, lon, resolution, stop)] = positions
+
+        for future in as_completed(futures):
+            positions = futures[future]
+            result = future.result()
+
+            # if results returned add to the data
+            if result != None:
+                row = result.to_row_dict()
+                for p in positions:
+                    rows[p] = row
+
+            pbar.update(len(positions)) # update progress bar
+
+            # save a checkpoint every FLUSH_EVERY rows
+            if pbar.n - last_flush >= FLUSH_EVERY:
+                save_checkpoint(df, write_rows(df, rows, columns), checkpoint)
+                last_flush = pbar.n
+    except BaseException:
+        # keep the searches finished since the last checkpoint before stopping
+        save_checkpoint(df, write_rows(df, rows, columns), checkpoint)
+        raise
+    finally:
+        # if interrupted, don't start the remaining searches and don't wait for the running ones
+        stop.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    write_rows(df, rows, columns)
     df.to_csv(args.csv, index=False) # save to csv
+    checkpoint.unlink(missing_ok=True)
     pbar.close()
 
     # move to download option if download is set